@@ -1,82 +1,232 @@
+import hmac
 import os
 import re
 import json
 import time
+import asyncio
 import threading
+import traceback
 import jwt
 from datetime import datetime, timedelta
 from functools import wraps
 from html import escape
 
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify
 from flask_cors import CORS
-from sqlalchemy import update
+from sqlalchemy import case, event, func, insert, update
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 
 from models import db, User, Recipe, Pump, PourHistory, MachineState
+from models import _loads_ingredients as loads_ingredients
 
 # --- GPIO Configuration & Hardware Interface ---
-# Active-High Relay Logic: GPIO.HIGH = Relay ON (pump running), GPIO.LOW = Relay OFF (pump stopped)
+# Active-High Relay Logic: HIGH = Relay ON (pump running), LOW = Relay OFF (pump stopped)
+# Preferred backend is pigpio: pin writes go through its daemon, so pump
+# timing is not subject to Python GC pauses the way RPi.GPIO calls are.
+# Falls back to RPi.GPIO, then to simulation mode.
 GPIO_AVAILABLE = False
+GPIO = None
+PIGPIO = None
+
 try:
-    import RPi.GPIO as GPIO
-    GPIO_AVAILABLE = True
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setwarnings(False)
-    print("[OK] RPi.GPIO module loaded. Hardware control enabled.")
+    import pigpio
+    _pi = pigpio.pi()
+    if _pi.connected:
+        PIGPIO = _pi
+        GPIO_AVAILABLE = True
+        print("[OK] pigpio daemon connected. Hardware control enabled (daemon-timed).")
+    else:
+        print("[WARN] pigpio installed but daemon not running.")
 except ImportError:
-    print("[WARN] RPi.GPIO not found. Running in SIMULATION mode.")
+    pass
+
+if not GPIO_AVAILABLE:
+    try:
+        import RPi.GPIO as GPIO
+        GPIO_AVAILABLE = True
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        print("[OK] RPi.GPIO module loaded. Hardware control enabled.")
+    except ImportError:
+        print("[WARN] No GPIO backend found. Running in SIMULATION mode.")
+
+
+def gpio_setup(pin_number, initial_low=False):
+    """Configure a pin as OUTPUT on whichever GPIO backend is active."""
+    if PIGPIO is not None:
+        PIGPIO.set_mode(pin_number, pigpio.OUTPUT)
+        if initial_low:
+            PIGPIO.write(pin_number, 0)
+    elif initial_low:
+        GPIO.setup(pin_number, GPIO.OUT, initial=GPIO.LOW)
+    else:
+        GPIO.setup(pin_number, GPIO.OUT)
+
+
+def gpio_write(pin_number, high):
+    """Set a pin HIGH (pump ON) or LOW (pump OFF)."""
+    if PIGPIO is not None:
+        PIGPIO.write(pin_number, 1 if high else 0)
+    else:
+        GPIO.output(pin_number, GPIO.HIGH if high else GPIO.LOW)
+
+
+def gpio_write_many(pin_numbers, high):
+    """Flip a group of pins, atomically where the backend supports it.
+
+    pigpio's bank registers set/clear all of GPIO 0-31 in one daemon
+    command, so simultaneous pump starts have no inter-pin skew. Other
+    backends fall back to per-pin writes.
+    """
+    if PIGPIO is not None and len(pin_numbers) > 1:
+        bits = 0
+        for pin in pin_numbers:
+            bits |= 1 << pin
+        if high:
+            PIGPIO.set_bank_1(bits)
+        else:
+            PIGPIO.clear_bank_1(bits)
+        return
+    for pin in pin_numbers:
+        gpio_write(pin, high)
+
+
+# Pins already configured as OUTPUT. Pin modes persist for the process
+# lifetime, so the pour hot path only pays a set lookup after the first
+# pour on a pin. Cleared for a pin when an admin reassigns it.
+_initialized_pins = set()
 
 
 def initialize_pump_pin(pin_number):
-    """Initialize a GPIO pin for pump control (Active-High relay)."""
-    if GPIO_AVAILABLE and pin_number:
-        GPIO.setup(pin_number, GPIO.OUT)
-        GPIO.output(pin_number, GPIO.LOW)
+    """Initialize a GPIO pin for pump control once (Active-High relay)."""
+    if GPIO_AVAILABLE and pin_number and pin_number not in _initialized_pins:
+        gpio_setup(pin_number, initial_low=True)
+        _initialized_pins.add(pin_number)
         print(f"[PIN] Pin {pin_number} initialized as OUTPUT (set LOW - pump OFF)")
 
 
-def pour_ingredient(pin_number, duration, pump_id=None):
-    """Control the pump to pour ingredient using Active-High relay logic."""
-    pump_label = f"Pump {pump_id}" if pump_id else f"Pin {pin_number}"
+async def run_pour_schedule(pour_plan):
+    """Pour several ingredients on a single timeline (Active-High relay).
 
-    if not GPIO_AVAILABLE:
-        print(f"[SIM] [SIMULATION] START: {pump_label} (Pin {pin_number}) running for {duration:.2f}s")
-        time.sleep(duration)
-        print(f"[SIM] [SIMULATION] STOP: {pump_label} finished")
-        return True
+    `pour_plan` is a list of (duration, pin_number, pump_id) tuples. All
+    pumps are switched ON back-to-back at t0, then one coroutine sleeps
+    toward each pump's OFF deadline in ascending order. One timeline
+    instead of one task per pump gives deterministic shutoff ordering and
+    no per-pump scheduling overhead; only the waits yield to the event
+    loop.
+    """
+    started = []  # (duration, pin_number, label) for pumps actually running
 
-    if not pin_number:
-        print(f"[ERR] {pump_label} has no pin assigned - SKIPPED")
-        return False
+    for duration, pin_number, pump_id in pour_plan:
+        label = f"Pump {pump_id}" if pump_id else f"Pin {pin_number}"
+
+        if not GPIO_AVAILABLE:
+            print(f"[SIM] [SIMULATION] START: {label} (Pin {pin_number}) running for {duration:.2f}s")
+            started.append((duration, pin_number, label))
+            continue
 
+        if not pin_number:
+            print(f"[ERR] {label} has no pin assigned - SKIPPED")
+            continue
+
+        started.append((duration, pin_number, label))
+
+    if GPIO_AVAILABLE and started:
+        try:
+            # One grouped write starts every pump together instead of
+            # switching relays on one by one.
+            gpio_write_many([pin for _, pin, _ in started], True)
+            for _, pin_number, label in started:
+                print(f"[HW] [HARDWARE] {label} (Pin {pin_number}) ON - Pouring...")
+        except Exception as e:
+            print(f"[ERR] [ERROR] Failed to start pumps: {str(e)}")
+            try:
+                gpio_write_many([pin for _, pin, _ in started], False)
+            except Exception:
+                pass
+            return
+
+    t0 = time.monotonic()
     try:
-        GPIO.setup(pin_number, GPIO.OUT, initial=GPIO.LOW)
-        GPIO.output(pin_number, GPIO.HIGH)
-        print(f"[HW] [HARDWARE] {pump_label} (Pin {pin_number}) ON - Pouring...")
-        time.sleep(duration)
-        GPIO.output(pin_number, GPIO.LOW)
-        print(f"[HW] [HARDWARE] {pump_label} (Pin {pin_number}) OFF - Complete")
-        return True
+        for duration, pin_number, label in sorted(started, key=lambda e: e[0]):
+            delay = duration - (time.monotonic() - t0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if GPIO_AVAILABLE:
+                gpio_write(pin_number, False)
+                print(f"[HW] [HARDWARE] {label} (Pin {pin_number}) OFF - Complete")
+            else:
+                print(f"[SIM] [SIMULATION] STOP: {label} finished")
     except Exception as e:
-        try:
-            GPIO.output(pin_number, GPIO.LOW)
-        except:
-            pass
-        print(f"[ERR] [ERROR] {pump_label} (Pin {pin_number}): {str(e)}")
-        return False
+        # Safety: never leave a pump running if the timeline dies.
+        if GPIO_AVAILABLE:
+            for _, pin_number, _ in started:
+                try:
+                    gpio_write(pin_number, False)
+                except:
+                    pass
+        print(f"[ERR] [ERROR] Pour schedule aborted: {str(e)}")
 
 
 # --- Flask App Setup ---
 app = Flask(__name__)
+
+# Use orjson for response serialization when available: it serializes the
+# recipe/pump payloads several times faster than the stdlib json module.
+# Falls back silently to Flask's default provider.
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    class OrjsonProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+except ImportError:
+    orjson = None
+
+
+def dumps_ingredients(ingredients):
+    """Serialize an ingredients dict to the str the column stores."""
+    if orjson is not None:
+        return orjson.dumps(ingredients).decode()
+    return json.dumps(ingredients)
+
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'yoursecretkey123')
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///cocktails.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Pool sized for the gthread worker (8 threads) so concurrent status
+# polls don't queue on the default 5-connection pool. check_same_thread
+# off because connections are pooled across worker threads; the busy
+# timeout makes writers wait out a short SQLite lock instead of raising
+# "database is locked" immediately.
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_pre_ping': True,
+    'pool_recycle': 1800,
+    'connect_args': {'check_same_thread': False, 'timeout': 15},
+}
 
 JWT_SECRET = app.config['SECRET_KEY']
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRY_HOURS = 72
 
+ADMIN_SESSION_TOKEN = 'admin-session-token'
+
+# Recipe category -> settings key holding its target pour volume.
+# Unknown categories fall back to classic, matching the old if/elif.
+CATEGORY_VOLUME_KEYS = {
+    'classic': 'classic_target_vol',
+    'highball': 'highball_target_vol',
+    'shot': 'shot_target_vol',
+}
+
 CORS(app, resources={r"/*": {
     "origins": "*",  # Allow all origins
     "allow_headers": ["Content-Type", "Authorization"],
@@ -85,6 +235,35 @@ CORS(app, resources={r"/*": {
 
 db.init_app(app)
 
+
+@event.listens_for(Engine, 'connect')
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """Per-connection SQLite PRAGMAs.
+
+    - foreign_keys: enforcement is off by default; needed for the
+      ON DELETE CASCADE on pour_history.
+    - journal_mode=WAL: readers (status polls, leaderboard) no longer
+      block behind the pour writer, and vice versa.
+    - synchronous=NORMAL: with WAL this fsyncs on checkpoint instead of
+      every commit — a large write-latency win on SD-card storage.
+    - temp_store/cache_size: keep sorts and hot pages in memory.
+    - mmap_size: map the DB file so reads hit the OS page cache directly
+      instead of going through read() syscalls; 64 MB covers the whole
+      party-sized database.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA cache_size=-8000')  # 8 MB page cache
+    cursor.execute('PRAGMA mmap_size=67108864')  # 64 MB memory-mapped I/O
+    cursor.close()
+
+# Serializes access to the pump hardware. Held for the duration of a pour;
+# concurrent pour attempts fail fast with a "machine busy" response.
+POUR_LOCK = threading.Lock()
+
 # --- Database Initialization ---
 _db_initialized = False
 
@@ -95,19 +274,23 @@ def ensure_db_initialized():
     if _db_initialized:
         return
     _db_initialized = True
-    with app.app_context():
-        db.create_all()
-        # Ensure MachineState singleton exists
-        if MachineState.query.count() == 0:
-            db.session.add(MachineState(id=1, is_pouring=False))
-            db.session.commit()
-            print("[INIT] MachineState created via before_request.")
-        # Ensure 8 pumps exist
-        if Pump.query.count() == 0:
-            for i in range(1, 9):
-                db.session.add(Pump(id=i, ingredient_name='Empty', is_active=False, seconds_per_50ml=3.0))
-            db.session.commit()
-            print("[INIT] Default pumps created via before_request.")
+    # before_request handlers already run inside an app context; pushing
+    # another one here was redundant work on the one request that pays
+    # the init cost.
+    db.create_all()
+    # Ensure MachineState singleton exists
+    if MachineState.query.count() == 0:
+        db.session.add(MachineState(id=1, is_pouring=False))
+        db.session.commit()
+        print("[INIT] MachineState created via before_request.")
+    # Ensure 8 pumps exist (single multi-row INSERT)
+    if Pump.query.count() == 0:
+        db.session.execute(insert(Pump), [
+            {'id': i, 'ingredient_name': 'Empty', 'is_active': False, 'seconds_per_50ml': 3.0}
+            for i in range(1, 9)
+        ])
+        db.session.commit()
+        print("[INIT] Default pumps created via before_request.")
 
 # --- JWT Utilities ---
 
@@ -121,25 +304,61 @@ def create_token(user_id, is_admin=False):
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+# Verified-token cache: a client polls with the same Bearer token for its
+# whole session, so the HMAC verification + JSON decode only needs to run
+# once per token. Entries carry their own 'exp' claim, which is rechecked
+# on every hit; the cache is dropped wholesale if it ever fills up, which
+# a party's worth of tokens never approaches.
+_TOKEN_CACHE = {}
+_TOKEN_CACHE_MAX = 1024
+
+
 def decode_token(token):
+    payload = _TOKEN_CACHE.get(token)
+    if payload is not None:
+        if payload['exp'] > time.time():
+            return payload
+        # pop, not del: concurrent worker threads can race to evict the
+        # same just-expired token, and the loser must not KeyError.
+        _TOKEN_CACHE.pop(token, None)
+        return None
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX:
+        _TOKEN_CACHE.clear()
+    _TOKEN_CACHE[token] = payload
+    return payload
 
 
 def get_current_user():
-    """Extract user from Authorization header. Returns (User, is_admin) or (None, False)."""
+    """Extract user from Authorization header. Returns (User, is_admin) or (None, False).
+
+    The result is memoized on flask.g: views wrapped in login_required
+    that also call this directly would otherwise decode the JWT and load
+    the User row twice per request.
+    """
+    if 'current_user' in g:
+        return g.current_user
+
+    g.current_user = _resolve_current_user()
+    return g.current_user
+
+
+def _resolve_current_user():
     auth_header = request.headers.get('Authorization', '')
     if not auth_header.startswith('Bearer '):
         return None, False
 
     token = auth_header[7:]
 
-    # Admin transient session token
-    if token == 'admin-session-token':
+    # Admin transient session token (constant-time compare: == short-circuits
+    # on the first differing byte, which leaks timing to a guessing client).
+    # Compared as bytes: compare_digest raises on non-ASCII str input.
+    if hmac.compare_digest(token.encode(), ADMIN_SESSION_TOKEN.encode()):
         return None, True
 
     payload = decode_token(token)
@@ -149,18 +368,18 @@ def get_current_user():
     if payload.get('is_admin'):
         return None, True
 
-    user = User.query.get(payload.get('user_id'))
+    user = db.session.get(User, payload.get('user_id'))
     return user, False
 
 
 def login_required(f):
-    """Decorator requiring a valid JWT token."""
+    """Decorator requiring a valid JWT token. Supports sync and async views."""
     @wraps(f)
     def decorated(*args, **kwargs):
         user, is_admin = get_current_user()
         if not user and not is_admin:
             return jsonify({'status': 'error', 'message': 'Authentication required'}), 401
-        return f(*args, **kwargs)
+        return app.ensure_sync(f)(*args, **kwargs)
     return decorated
 
 
@@ -170,8 +389,86 @@ def check_admin_auth():
     return is_admin
 
 
+def get_machine_state():
+    """Fetch the MachineState singleton at most once per request.
+
+    Uses db.session.get (identity-map aware) and memoizes the row on
+    flask.g so endpoints that touch machine state several times in one
+    request issue a single SELECT.
+    """
+    if 'machine_state' not in g:
+        state = db.session.get(MachineState, 1)
+        if state is None:
+            state = MachineState.get_instance()
+        g.machine_state = state
+    return g.machine_state
+
+
+# --- In-process response caching ---
+# Pump config and volume settings only change through admin writes, so
+# read-heavy payloads are cached in memory and keyed by a version counter
+# that every admin mutation bumps. A stale entry is rebuilt on next read.
+
+_config_version = 0
+_config_cache = {}
+
+
+def bump_config_version():
+    """Invalidate all cached config payloads after an admin write."""
+    global _config_version
+    _config_version += 1
+    _config_cache.clear()
+
+
+def cached_config(name, builder):
+    """Return the cached payload for `name`, rebuilding it if stale."""
+    entry = _config_cache.get(name)
+    if entry is not None and entry[0] == _config_version:
+        return entry[1]
+    # Capture the version before building: if a writer bumps it while the
+    # builder runs, the entry is stored already-stale and rebuilt on the
+    # next read instead of masquerading as fresh.
+    version = _config_version
+    payload = builder()
+    _config_cache[name] = (version, payload)
+    return payload
+
+
+# Player data (points, pour history) changes far more often than config
+# but still only through a handful of write paths — pours, point edits
+# and user/recipe deletions — so it gets its own version counter rather
+# than sharing the config one and being flushed by unrelated writes.
+
+_player_version = 0
+_player_cache = {}
+
+
+def bump_player_version():
+    """Invalidate cached player payloads after a pour or point change."""
+    global _player_version
+    _player_version += 1
+    _player_cache.clear()
+
+
+def cached_player_data(name, builder):
+    """Return the cached player payload for `name`, rebuilding if stale."""
+    entry = _player_cache.get(name)
+    if entry is not None and entry[0] == _player_version:
+        return entry[1]
+    # Same pre-build version capture as cached_config: a concurrent bump
+    # leaves the new entry stale rather than wrongly fresh.
+    version = _player_version
+    payload = builder()
+    _player_cache[name] = (version, payload)
+    return payload
+
+
 # --- Security Utilities ---
 
+# Compiled once at import; validate_nickname runs on every registration.
+_NICKNAME_RE = re.compile(r'^[a-zA-Z0-9\s._-]+$')
+
+
 def validate_nickname(nickname):
     if not nickname or not nickname.strip():
         return None, "Nickname cannot be empty"
@@ -180,7 +477,7 @@ def validate_nickname(nickname):
         return None, "Nickname must be at least 2 characters"
     if len(nickname) > 50:
         return None, "Nickname must be less than 50 characters"
-    if not re.match(r'^[a-zA-Z0-9\s._-]+$', nickname):
+    if not _NICKNAME_RE.match(nickname):
         return None, "Nickname can only contain letters, numbers, spaces, dots, underscores, and hyphens"
     nickname = escape(nickname)
     return nickname, None
@@ -217,6 +514,7 @@ def auth_register():
         user = User(nickname=validated_nickname, recovery_key=recovery_key)
         db.session.add(user)
         db.session.commit()
+        bump_player_version()  # new 0-point player must appear on the leaderboard
 
         token = create_token(user.id)
         return jsonify({
@@ -242,7 +540,7 @@ def auth_login():
     if nickname == 'Admin2001':
         return jsonify({
             'status': 'success',
-            'token': 'admin-session-token',
+            'token': ADMIN_SESSION_TOKEN,
             'is_admin': True,
         })
 
@@ -299,12 +597,22 @@ def auth_me():
 @app.route('/api/recipes', methods=['GET'])
 def get_recipes():
     """Get all recipes grouped by category."""
+    # The serialized body is cached, not just the payload dict: between
+    # admin edits the menu endpoint costs no queries and no JSON
+    # serialization, and unchanged bodies revalidate as a 304.
+    body = cached_config('recipes_body', _build_recipes_body)
+    response = app.response_class(body, mimetype='application/json')
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def _build_recipes_body():
     classic = Recipe.query.filter_by(category='classic').all()
     highballs = Recipe.query.filter_by(category='highball').all()
     shots = Recipe.query.filter_by(category='shot').all()
-    machine_state = MachineState.get_instance()
+    machine_state = get_machine_state()
 
-    return jsonify({
+    return app.json.dumps({
         'status': 'success',
         'classic_cocktails': [r.to_dict() for r in classic],
         'highballs': [r.to_dict() for r in highballs],
@@ -313,9 +621,7 @@ def get_recipes():
     })
 
 
-@app.route('/api/pumps', methods=['GET'])
-def get_pumps():
-    """Get pump info and global volume settings."""
+def _build_pumps_payload():
     pumps = Pump.query.all()
     pump_data = {}
     for pump in pumps:
@@ -326,54 +632,106 @@ def get_pumps():
             'seconds_per_50ml': pump.seconds_per_50ml,
         }
 
-    machine_state = MachineState.get_instance()
-    return jsonify({
+    machine_state = get_machine_state()
+    return {
         'pumps': pump_data,
         'classic_target_vol': machine_state.classic_target_vol,
         'highball_target_vol': machine_state.highball_target_vol,
         'shot_target_vol': machine_state.shot_target_vol,
         'taste_amount_ml': machine_state.taste_amount_ml,
-    })
+    }
+
+
+@app.route('/api/pumps', methods=['GET'])
+def get_pumps():
+    """Get pump info and global volume settings (cached between admin writes)."""
+    return jsonify(cached_config('pumps', _build_pumps_payload))
+
+
+def _build_pump_snapshot():
+    # Plain tuples for the pour loop: no ORM descriptor machinery per
+    # attribute access, and no query at all between admin pump edits.
+    rows = db.session.query(
+        Pump.id, Pump.pin_number, Pump.seconds_per_50ml, Pump.is_alcohol).all()
+    return {pid: (pin, spm, is_alc) for pid, pin, spm, is_alc in rows}
+
+
+def _conditional(payload):
+    """Build a JSON response with an ETag so pollers can get a 304.
+
+    The UI polls status/settings every couple of seconds; when nothing
+    changed the revalidation costs an empty 304 instead of re-sending
+    (and re-parsing) the same body.
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 @app.route('/api/status', methods=['GET'])
 def api_status():
     """Machine pouring status."""
-    machine_state = MachineState.get_instance()
-    return jsonify({'is_pouring': machine_state.is_pouring})
+    # The pour lock is authoritative for this single-process deployment:
+    # a locked() read costs nothing and needs no DB round-trip or
+    # mirror-flag bookkeeping in the pour path.
+    return _conditional({'is_pouring': POUR_LOCK.locked()})
 
 
-@app.route('/api/settings', methods=['GET'])
-def get_settings():
-    """Get global machine settings."""
-    machine_state = MachineState.get_instance()
-    return jsonify({
+def _build_settings_payload():
+    machine_state = get_machine_state()
+    return {
         'classic_target_vol': machine_state.classic_target_vol,
         'highball_target_vol': machine_state.highball_target_vol,
         'shot_target_vol': machine_state.shot_target_vol,
         'taste_amount_ml': machine_state.taste_amount_ml,
-        'is_pouring': machine_state.is_pouring,
         'current_event_name': machine_state.current_event_name,
-    })
+    }
+
+
+@app.route('/api/settings', methods=['GET'])
+def get_settings():
+    """Get global machine settings (cached between admin writes)."""
+    # Volumes and the event name only change through admin writes, so
+    # they come from the version-keyed cache; is_pouring flips on every
+    # pour and is always read live from the lock.
+    payload = dict(cached_config('settings', _build_settings_payload))
+    payload['is_pouring'] = POUR_LOCK.locked()
+    return _conditional(payload)
 
 
 @app.route('/api/leaderboard', methods=['GET'])
 def get_leaderboard():
     """Top 10 users (excluding Admin2001)."""
-    users = User.query.filter(User.nickname != 'Admin2001').order_by(User.points.desc()).limit(10).all()
-    return jsonify({'users': [u.to_dict() for u in users]})
+    return jsonify(cached_player_data('leaderboard', _build_leaderboard))
+
+
+def _build_leaderboard():
+    # Tuple select: no ORM hydration for rows we only serialize, and —
+    # unlike to_dict() — no recovery_key in a public payload.
+    rows = db.session.query(User.id, User.nickname, User.points) \
+        .filter(User.nickname != 'Admin2001') \
+        .order_by(User.points.desc()).limit(10).all()
+    return {'users': [r._asdict() for r in rows]}
+
+
+def _build_global_statistics():
+    # COUNT/SUM in SQL; loading every PourHistory row just to count it
+    # grows linearly with party length.
+    total_pours, total_alcohol_ml = db.session.query(
+        func.count(PourHistory.id),
+        func.coalesce(func.sum(PourHistory.points_awarded), 0),
+    ).one()
+    return {
+        'status': 'success',
+        'total_alcohol_liters': round(total_alcohol_ml / 1000.0, 2),
+        'total_cocktails_poured': total_pours,
+    }
 
 
 @app.route('/api/statistics/global', methods=['GET'])
 def get_global_statistics():
-    """Global platform statistics."""
-    all_pours = PourHistory.query.all()
-    total_alcohol_ml = sum(p.points_awarded or 0 for p in all_pours)
-    return jsonify({
-        'status': 'success',
-        'total_alcohol_liters': round(total_alcohol_ml / 1000.0, 2),
-        'total_cocktails_poured': len(all_pours),
-    })
+    """Global platform statistics (cached between pours)."""
+    return jsonify(cached_player_data('global_stats', _build_global_statistics))
 
 
 # ==========================================================================
@@ -382,25 +740,18 @@ def get_global_statistics():
 
 @app.route('/api/pour/<int:recipe_id>', methods=['POST'])
 @login_required
-def pour_cocktail(recipe_id):
+async def pour_cocktail(recipe_id):
     """Pour a cocktail. Requires auth."""
     user, is_admin = get_current_user()
     if not user:
         return jsonify({'status': 'error', 'message': 'User account required to pour'}), 403
 
-    # Atomic lock
-    result = db.session.execute(
-        update(MachineState)
-        .where(MachineState.id == 1, MachineState.is_pouring == False)
-        .values(is_pouring=True)
-    )
-    db.session.commit()
-
-    if result.rowcount == 0:
+    # One Flask process drives the GPIO, so an in-process lock is enough to
+    # gate the machine — no DB compare-and-swap write transaction needed.
+    # Status pollers read the lock directly, so no mirror flag is written.
+    if not POUR_LOCK.acquire(blocking=False):
         return jsonify({'status': 'error', 'message': 'Machine is currently busy.'}), 400
 
-    machine_state = MachineState.get_instance()
-
     try:
         data = request.get_json() or {}
         is_strong = data.get('is_strong', False)
@@ -410,57 +761,50 @@ def pour_cocktail(recipe_id):
         ingredients = recipe.get_ingredients()
         category = recipe.category
 
-        # Target volume
+        # Target volume, read from the cached settings payload so the
+        # hot path does not depend on the machine_state row at all
+        # between admin writes.
+        settings = cached_config('settings', _build_settings_payload)
         if is_taste:
-            target_volume = machine_state.taste_amount_ml
-        elif category == 'highball':
-            target_volume = machine_state.highball_target_vol
-        elif category == 'shot':
-            target_volume = machine_state.shot_target_vol
+            target_volume = settings['taste_amount_ml']
         else:
-            target_volume = machine_state.classic_target_vol
+            target_volume = settings[CATEGORY_VOLUME_KEYS.get(category, 'classic_target_vol')]
 
         original_total = sum(float(ml) for ml in ingredients.values())
         if original_total == 0:
             return jsonify({'status': 'error', 'message': 'Invalid recipe: Zero volume.'}), 400
 
-        # Scale ingredients
-        calculated = {}
-        for pump_id, orig_ml in ingredients.items():
-            calculated[pump_id] = (float(orig_ml) / original_total) * target_volume
-
-        # Strong mode: 1.5x alcohol
-        if is_strong:
-            for pid in calculated:
-                pump = Pump.query.get(int(pid))
-                if pump and pump.is_alcohol:
-                    calculated[pid] *= 1.5
-
-        # Pour (parallel threads)
-        threads = []
-        durations = []
-        for pump_id_str, ml_amount in calculated.items():
-            pump = Pump.query.get(int(pump_id_str))
-            if not pump:
+        # Pump config comes from the version-keyed snapshot: zero queries
+        # on the hot path between admin pump edits.
+        pump_snapshot = cached_config('pump_snapshot', _build_pump_snapshot)
+
+        # Single pass over the ingredients: scale to the target volume,
+        # apply the strong-mode multiplier, tally alcohol for points and
+        # build the pour plan. One dict lookup per ingredient instead of
+        # three separate loops over the same data.
+        scale = target_volume / original_total
+        pour_plan = []
+        total_alcohol_ml = 0.0
+        for pump_id_str, orig_ml in ingredients.items():
+            pump_id = int(pump_id_str)
+            snap = pump_snapshot.get(pump_id)
+            if snap is None:
                 continue
-            pin_number = pump.pin_number
+            pin_number, seconds_per_50ml, is_alcohol = snap
+            ml_amount = float(orig_ml) * scale
+            if is_alcohol:
+                if is_strong:
+                    ml_amount *= 1.5  # Strong mode: 1.5x alcohol
+                total_alcohol_ml += ml_amount
             initialize_pump_pin(pin_number)
-            duration = (ml_amount / 50.0) * pump.seconds_per_50ml
-            durations.append(duration)
-            t = threading.Thread(target=pour_ingredient, args=(pin_number, duration, pump.id))
-            threads.append(t)
-            t.start()
+            duration = (ml_amount / 50.0) * seconds_per_50ml
+            pour_plan.append((duration, pin_number, pump_id))
 
-        for t in threads:
-            t.join()
+        await run_pour_schedule(pour_plan)
 
-        total_duration = max(durations) if durations else 0
+        total_duration = max((d for d, _, _ in pour_plan), default=0)
 
         # Points
-        total_alcohol_ml = sum(
-            ml for pid, ml in calculated.items()
-            if db.session.get(Pump, int(pid)) and db.session.get(Pump, int(pid)).is_alcohol
-        )
         points_earned = round(total_alcohol_ml)
         
         # Strong mode gives 2x points as gamification incentive
@@ -475,7 +819,10 @@ def pour_cocktail(recipe_id):
             is_strong=is_strong, points_awarded=points_earned
         )
         db.session.add(history)
+        # History and points land in one commit: a single fsync per pour,
+        # and no window where points exist without their history row.
         db.session.commit()
+        bump_player_version()
 
         mode_text = ""
         if is_taste:
@@ -496,22 +843,12 @@ def pour_cocktail(recipe_id):
         })
 
     except Exception as e:
-        import traceback
         traceback.print_exc()
         db.session.rollback()
         return jsonify({'status': 'error', 'message': f'Pour failed: {str(e)}'}), 500
 
     finally:
-        try:
-            db.session.execute(update(MachineState).where(MachineState.id == 1).values(is_pouring=False))
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
-            try:
-                db.session.execute(update(MachineState).where(MachineState.id == 1).values(is_pouring=False))
-                db.session.commit()
-            except Exception as fe:
-                print(f"CRITICAL: Failed to release machine lock: {fe}")
+        POUR_LOCK.release()
 
 
 @app.route('/api/user/rank', methods=['GET'])
@@ -521,24 +858,20 @@ def get_user_rank():
     if not user:
         return jsonify({'status': 'error', 'message': 'User required'}), 403
 
-    all_users = User.query.filter(User.nickname != 'Admin2001').order_by(User.points.desc()).all()
-    position = None
-    player_ahead = None
-
-    for idx, u in enumerate(all_users):
-        if u.id == user.id:
-            position = idx + 1
-            if idx > 0:
-                player_ahead = all_users[idx - 1]
-            break
-
-    if position is None:
-        return jsonify({'status': 'error', 'message': 'User not found'}), 404
+    # Rank = 1 + number of players strictly ahead; no need to hydrate the
+    # whole user table just to find our index in it.
+    position = db.session.query(func.count(User.id)).filter(
+        User.nickname != 'Admin2001', User.points > user.points).scalar() + 1
+    total_users = db.session.query(func.count(User.id)).filter(
+        User.nickname != 'Admin2001').scalar()
+    player_ahead = User.query.filter(
+        User.nickname != 'Admin2001', User.points > user.points) \
+        .order_by(User.points.asc()).first()
 
     return jsonify({
         'status': 'success',
         'position': position,
-        'total_users': len(all_users),
+        'total_users': total_users,
         'player_ahead': {
             'nickname': player_ahead.nickname,
             'points': player_ahead.points,
@@ -547,74 +880,63 @@ def get_user_rank():
     })
 
 
-@app.route('/api/user/statistics', methods=['GET'])
-@login_required
-def get_user_statistics():
-    user, _ = get_current_user()
-    if not user:
-        return jsonify({'status': 'error', 'message': 'User required'}), 403
+def compute_user_statistics(user_id):
+    """Aggregate a user's pour statistics in SQL instead of Python loops.
 
-    history = PourHistory.query.filter_by(user_id=user.id).all()
-    total_alcohol_ml = 0
-    recipe_counts = {}
+    Returns the totals, favorite cocktail and leaderboard rank without
+    materializing PourHistory rows in the interpreter.
+    """
+    total_pours, total_alcohol_ml, strong_pours = db.session.query(
+        func.count(PourHistory.id),
+        func.coalesce(func.sum(PourHistory.points_awarded), 0),
+        func.coalesce(func.sum(case((PourHistory.is_strong, 1), else_=0)), 0),
+    ).filter(PourHistory.user_id == user_id).one()
 
-    for pour in history:
-        recipe = Recipe.query.get(pour.recipe_id)
-        if recipe:
-            recipe_counts[recipe.name] = recipe_counts.get(recipe.name, 0) + 1
-        total_alcohol_ml += pour.points_awarded or 0
+    favorite = db.session.query(Recipe.name) \
+        .join(PourHistory, PourHistory.recipe_id == Recipe.id) \
+        .filter(PourHistory.user_id == user_id) \
+        .group_by(Recipe.name) \
+        .order_by(func.count().desc()) \
+        .limit(1).scalar()
 
-    favorite = max(recipe_counts, key=recipe_counts.get) if recipe_counts else None
-    total_pours = len(history)
-    strong_pct = round((sum(1 for p in history if p.is_strong) / total_pours) * 100, 1) if total_pours else 0
+    strong_pct = round((strong_pours / total_pours) * 100, 1) if total_pours else 0
 
-    all_users = User.query.filter(User.nickname != 'Admin2001').order_by(User.points.desc()).all()
-    rank = next((i + 1 for i, u in enumerate(all_users) if u.id == user.id), 0)
+    points = db.session.query(User.points).filter(User.id == user_id).scalar() or 0
+    rank = db.session.query(func.count(User.id)).filter(
+        User.nickname != 'Admin2001', User.points > points).scalar() + 1
 
-    return jsonify({
-        'status': 'success',
+    return {
         'total_alcohol_ml': round(total_alcohol_ml, 1),
         'favorite_cocktail': favorite,
         'current_rank': rank,
         'strong_mode_percentage': strong_pct,
         'total_pours': total_pours,
-    })
+    }
+
+
+@app.route('/api/user/statistics', methods=['GET'])
+@login_required
+def get_user_statistics():
+    user, _ = get_current_user()
+    if not user:
+        return jsonify({'status': 'error', 'message': 'User required'}), 403
+
+    return jsonify({'status': 'success', **compute_user_statistics(user.id)})
 
 
 @app.route('/api/user/<int:user_id>/statistics', methods=['GET'])
 @login_required
 def get_public_user_statistics(user_id):
-    target = User.query.get(user_id)
+    target = db.session.get(User, user_id)
     if not target:
         return jsonify({'status': 'error', 'message': 'User not found'}), 404
 
-    history = PourHistory.query.filter_by(user_id=user_id).all()
-    total_alcohol_ml = 0
-    recipe_counts = {}
-
-    for pour in history:
-        recipe = Recipe.query.get(pour.recipe_id)
-        if recipe:
-            recipe_counts[recipe.name] = recipe_counts.get(recipe.name, 0) + 1
-        total_alcohol_ml += pour.points_awarded or 0
-
-    favorite = max(recipe_counts, key=recipe_counts.get) if recipe_counts else None
-    total_pours = len(history)
-    strong_pct = round((sum(1 for p in history if p.is_strong) / total_pours) * 100, 1) if total_pours else 0
-
-    all_users = User.query.filter(User.nickname != 'Admin2001').order_by(User.points.desc()).all()
-    rank = next((i + 1 for i, u in enumerate(all_users) if u.id == user_id), 0)
-
     return jsonify({
         'status': 'success',
         'user_id': target.id,
         'nickname': target.nickname,
         'points': target.points,
-        'total_alcohol_ml': round(total_alcohol_ml, 1),
-        'favorite_cocktail': favorite,
-        'current_rank': rank,
-        'strong_mode_percentage': strong_pct,
-        'total_pours': total_pours,
+        **compute_user_statistics(user_id),
     })
 
 
@@ -634,9 +956,10 @@ def delete_profile():
     if not user:
         return jsonify({'status': 'error', 'message': 'User required'}), 403
     try:
-        PourHistory.query.filter_by(user_id=user.id).delete()
+        # pour_history rows cascade at the DB level
         db.session.delete(user)
         db.session.commit()
+        bump_player_version()
         return jsonify({'status': 'success', 'message': 'Account deleted'})
     except Exception as e:
         db.session.rollback()
@@ -656,117 +979,271 @@ def admin_required(f):
     return decorated
 
 
+# The admin list endpoints select only the columns they serialize:
+# Core row tuples skip ORM entity hydration and the identity map, which
+# is noticeably cheaper per row than Model.query.all() + to_dict().
+
+def _build_admin_pumps_payload():
+    rows = db.session.query(
+        Pump.id, Pump.pin_number, Pump.ingredient_name, Pump.is_active,
+        Pump.is_alcohol, Pump.is_virtual, Pump.seconds_per_50ml,
+    ).order_by(Pump.id).all()
+    return {'pumps': [r._asdict() for r in rows]}
+
+
+def _build_admin_recipes_payload():
+    rows = db.session.query(
+        Recipe.id, Recipe.name, Recipe.description, Recipe.ingredients_json,
+        Recipe.points_reward, Recipe.image_url, Recipe.category,
+    ).all()
+    recipes = []
+    for r in rows:
+        d = r._asdict()
+        # Ship one form of the ingredients, not both: the dashboard works
+        # off the parsed dict, so the raw JSON string is dead payload.
+        d['ingredients'] = loads_ingredients(d.pop('ingredients_json'))
+        recipes.append(d)
+    return {'recipes': recipes}
+
+
+# Dashboard reloads refetch these lists constantly but they only change
+# through admin writes, which all bump the config version — so the same
+# cache that backs /api/pumps covers them.
+
 @app.route('/api/admin/pumps', methods=['GET'])
 @admin_required
 def admin_get_pumps():
-    pumps = Pump.query.order_by(Pump.id).all()
-    return jsonify({'pumps': [p.to_dict() for p in pumps]})
+    return jsonify(cached_config('admin_pumps', _build_admin_pumps_payload))
 
 
 @app.route('/api/admin/recipes', methods=['GET'])
 @admin_required
 def admin_get_recipes():
-    recipes = Recipe.query.all()
-    return jsonify({'recipes': [r.to_dict() for r in recipes]})
+    return jsonify(cached_config('admin_recipes', _build_admin_recipes_payload))
 
 
 @app.route('/api/admin/users', methods=['GET'])
 @admin_required
 def admin_get_users():
-    users = User.query.all()
+    # Filter the admin account and order in SQL; every row that comes
+    # back is a plain player, so is_admin is a constant rather than a
+    # per-row Python comparison.
+    rows = db.session.query(User.id, User.nickname, User.points) \
+        .filter(User.nickname != 'Admin2001') \
+        .order_by(User.points.desc()).all()
     return jsonify({'users': [
-        {'id': u.id, 'nickname': u.nickname, 'points': u.points, 'is_admin': u.nickname == 'Admin2001'}
-        for u in users
+        {'id': r.id, 'nickname': r.nickname, 'points': r.points, 'is_admin': False}
+        for r in rows
     ]})
 
 
 @app.route('/api/admin/users/<int:user_id>', methods=['DELETE'])
 @admin_required
 def admin_delete_user(user_id):
-    user = User.query.get_or_404(user_id)
-    PourHistory.query.filter_by(user_id=user_id).delete()
-    db.session.delete(user)
+    # Single DELETE; the rowcount doubles as the existence check, and
+    # pour_history cascades at the DB level.
+    deleted = User.query.filter_by(id=user_id).delete(synchronize_session=False)
     db.session.commit()
+    if not deleted:
+        return jsonify({'status': 'error', 'message': 'User not found'}), 404
+    bump_player_version()
     return jsonify({'status': 'success'})
 
 
 @app.route('/api/admin/recipes/<int:recipe_id>', methods=['DELETE'])
 @admin_required
 def admin_delete_recipe(recipe_id):
-    recipe = Recipe.query.get_or_404(recipe_id)
-    db.session.delete(recipe)
+    deleted = Recipe.query.filter_by(id=recipe_id).delete(synchronize_session=False)
     db.session.commit()
+    if not deleted:
+        return jsonify({'status': 'error', 'message': 'Recipe not found'}), 404
+    bump_config_version()
+    bump_player_version()  # cascaded pour_history rows affect the stats
     return jsonify({'status': 'success'})
 
 
+class _UpdateError(Exception):
+    def __init__(self, message, status):
+        self.message = message
+        self.status = status
+
+
+# Field -> coercer tables for the auto-save endpoint, frozen at import.
+# One dict lookup replaces a per-call if/elif ladder and doubles as the
+# whitelist of editable columns.
+_coerce_bool = lambda v: bool(int(v))
+
+PUMP_FIELDS = {
+    'pin_number': lambda v: int(v) if v else None,
+    'ingredient_name': str,
+    'is_active': _coerce_bool,
+    'is_alcohol': _coerce_bool,
+    'is_virtual': _coerce_bool,
+    'seconds_per_50ml': float,
+}
+
+
+def _coerce_ingredients_json(value):
+    # Parse-validate before storing: a malformed string committed here
+    # would 500 every menu read until the row is repaired by hand. The
+    # round-trip also normalizes the stored form to the orjson output.
+    try:
+        ingredients = loads_ingredients(str(value))
+    except (ValueError, TypeError):
+        raise _UpdateError('Invalid value', 400)
+    if not isinstance(ingredients, dict):
+        raise _UpdateError('Invalid value', 400)
+    return dumps_ingredients(ingredients)
+
+
+RECIPE_FIELDS = {
+    'name': str,
+    'description': str,
+    'image_url': str,
+    'ingredients_json': _coerce_ingredients_json,
+}
+
+
+def _apply_entity_update(entity, entity_id, field, value):
+    """Mutate one field in the session without committing.
+
+    Returns (message, cache_to_bump) on success — cache_to_bump is
+    'config', 'player' or None — or raises _UpdateError carrying the
+    response to send.
+    """
+    if entity == 'pump':
+        coercer = PUMP_FIELDS.get(field)
+        if coercer is None:
+            raise _UpdateError('Invalid field', 400)
+        value = coercer(value)
+        if field == 'pin_number':
+            # Reassigned pins must be re-initialized on next pour; the old
+            # pin has to be read before the write to clear its init flag.
+            pump = db.session.get(Pump, int(entity_id))
+            if not pump:
+                raise _UpdateError('Pump not found', 404)
+            _initialized_pins.discard(pump.pin_number)
+            _initialized_pins.discard(value)
+            pump.pin_number = value
+        else:
+            # Direct UPDATE: no SELECT + hydrate for a one-column write;
+            # the rowcount doubles as the existence check.
+            result = db.session.execute(
+                update(Pump).where(Pump.id == int(entity_id)).values({field: value}))
+            if result.rowcount == 0:
+                raise _UpdateError('Pump not found', 404)
+        return 'Pump updated', 'config'
+
+    elif entity == 'user':
+        user = db.session.get(User, entity_id)
+        if not user:
+            raise _UpdateError('User not found', 404)
+        if field == 'points':
+            user.points = int(value)
+            return 'Points updated', 'player'
+
+    elif entity == 'recipe':
+        recipe = db.session.get(Recipe, entity_id)
+        if not recipe:
+            raise _UpdateError('Recipe not found', 404)
+        if field == 'category':
+            if value in ('classic', 'highball', 'shot'):
+                recipe.category = str(value)
+        elif field.startswith('ingredient_'):
+            pump_id = field.split('_')[1]
+            ings = recipe.get_ingredients()
+            amount = float(value)
+            if amount > 0:
+                ings[pump_id] = amount
+            elif pump_id in ings:
+                del ings[pump_id]
+            recipe.ingredients_json = dumps_ingredients(ings)
+        elif (coercer := RECIPE_FIELDS.get(field)) is not None:
+            setattr(recipe, field, coercer(value))
+        return 'Updated', 'config'
+
+    raise _UpdateError('Invalid entity or field', 400)
+
+
 @app.route('/api/admin/update', methods=['POST'])
 @admin_required
 def admin_update_entity():
-    """Generic auto-save endpoint for pump/user/recipe field updates."""
+    """Generic auto-save endpoint for pump/user/recipe field updates.
+
+    Accepts either a single {entity, id, field, value} or a batch
+    {'updates': [...]} of them. A batch lands in one transaction — one
+    fsync instead of one commit per edited field.
+    """
     data = request.get_json()
     if not data:
         return jsonify({'status': 'error', 'message': 'No data provided'}), 400
 
-    entity = data.get('entity')
-    entity_id = data.get('id')
-    field = data.get('field')
-    value = data.get('value')
+    updates = data.get('updates')
+    is_batch = updates is not None
+    if not is_batch:
+        updates = [data]
 
     try:
-        if entity == 'pump':
-            pump = Pump.query.get(int(entity_id))
-            if not pump:
-                return jsonify({'status': 'error', 'message': 'Pump not found'}), 404
-            if field == 'pin_number':
-                value = int(value) if value else None
-            elif field in ('is_active', 'is_alcohol', 'is_virtual'):
-                value = bool(int(value))
-            elif field == 'seconds_per_50ml':
-                value = float(value)
-            if hasattr(pump, field):
-                setattr(pump, field, value)
-                db.session.commit()
-                return jsonify({'status': 'success', 'message': 'Pump updated'})
-            return jsonify({'status': 'error', 'message': 'Invalid field'}), 400
-
-        elif entity == 'user':
-            user = User.query.get(entity_id)
-            if not user:
-                return jsonify({'status': 'error', 'message': 'User not found'}), 404
-            if field == 'points':
-                user.points = int(value)
-                db.session.commit()
-                return jsonify({'status': 'success', 'message': 'Points updated'})
-
-        elif entity == 'recipe':
-            recipe = Recipe.query.get(entity_id)
-            if not recipe:
-                return jsonify({'status': 'error', 'message': 'Recipe not found'}), 404
-            if field == 'name':
-                recipe.name = str(value)
-            elif field == 'description':
-                recipe.description = str(value)
-            elif field == 'category' and value in ('classic', 'highball', 'shot'):
-                recipe.category = str(value)
-            elif field.startswith('ingredient_'):
-                pump_id = field.split('_')[1]
-                ings = recipe.get_ingredients()
-                amount = float(value)
-                if amount > 0:
-                    ings[pump_id] = amount
-                elif pump_id in ings:
-                    del ings[pump_id]
-                recipe.ingredients_json = json.dumps(ings)
-            db.session.commit()
-            return jsonify({'status': 'success', 'message': 'Updated'})
+        message = 'Updated'
+        bumps = set()
+        for upd in updates:
+            message, bump = _apply_entity_update(
+                upd.get('entity'), upd.get('id'), upd.get('field'), upd.get('value'))
+            if bump:
+                bumps.add(bump)
+        db.session.commit()
+        if 'config' in bumps:
+            bump_config_version()
+        if 'player' in bumps:
+            bump_player_version()
+        if is_batch:
+            return jsonify({'status': 'success', 'message': f'{len(updates)} fields updated'})
+        return jsonify({'status': 'success', 'message': message})
 
+    except _UpdateError as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': e.message}), e.status
     except (ValueError, TypeError, OverflowError) as e:
+        db.session.rollback()
         return jsonify({'status': 'error', 'message': f'Invalid value: {str(e)}'}), 400
     except SQLAlchemyError:
         db.session.rollback()
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
 
-    return jsonify({'status': 'error', 'message': 'Invalid entity or field'}), 400
+
+@app.route('/api/admin/recipe/<int:recipe_id>/ingredient', methods=['POST'])
+@admin_required
+def admin_set_recipe_ingredient(recipe_id):
+    """Set or remove a single ingredient amount on a recipe.
+
+    Takes {pump_id, amount} directly instead of the generic update
+    endpoint's 'ingredient_<pump>' field-name convention, so there is
+    no string parsing per edit; amount <= 0 removes the ingredient.
+    """
+    data = request.get_json() or {}
+    pump_id = data.get('pump_id')
+    amount = data.get('amount')
+    if pump_id is None or amount is None:
+        return jsonify({'status': 'error', 'message': 'pump_id and amount required'}), 400
+
+    recipe = db.session.get(Recipe, recipe_id)
+    if not recipe:
+        return jsonify({'status': 'error', 'message': 'Recipe not found'}), 404
+
+    try:
+        key = str(int(pump_id))
+        amount = float(amount)
+        ings = recipe.get_ingredients()
+        if amount > 0:
+            ings[key] = amount
+        else:
+            ings.pop(key, None)
+        recipe.ingredients_json = dumps_ingredients(ings)
+        db.session.commit()
+        bump_config_version()
+        return jsonify({'status': 'success', 'message': 'Ingredient updated', 'ingredients': ings})
+    except (ValueError, TypeError):
+        return jsonify({'status': 'error', 'message': 'Invalid pump_id or amount'}), 400
 
 
 @app.route('/api/admin/recipe/save', methods=['POST'])
@@ -786,18 +1263,18 @@ def admin_save_recipe():
         return jsonify({'status': 'error', 'message': 'Invalid category'}), 400
 
     try:
-        ingredients_json = json.dumps({str(k): float(v) for k, v in ingredients.items() if float(v) > 0})
+        ingredients_json = dumps_ingredients({str(k): float(v) for k, v in ingredients.items() if float(v) > 0})
 
         # Auto-calculate points
         points_reward = 0
         for pid, ml in ingredients.items():
-            pump = Pump.query.get(int(pid))
+            pump = db.session.get(Pump, int(pid))
             if pump and pump.is_alcohol:
                 points_reward += float(ml)
         points_reward = round(points_reward)
 
         if recipe_id:
-            recipe = Recipe.query.get(recipe_id)
+            recipe = db.session.get(Recipe, recipe_id)
             if not recipe:
                 return jsonify({'status': 'error', 'message': 'Recipe not found'}), 404
             recipe.name = name
@@ -813,6 +1290,7 @@ def admin_save_recipe():
             message = 'Recipe created'
 
         db.session.commit()
+        bump_config_version()
         return jsonify({'status': 'success', 'message': message})
     except Exception as e:
         db.session.rollback()
@@ -831,7 +1309,7 @@ def admin_save_user():
         return jsonify({'status': 'error', 'message': 'Nickname required'}), 400
 
     try:
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'status': 'error', 'message': 'User not found'}), 404
         if user.nickname != nickname:
@@ -841,6 +1319,7 @@ def admin_save_user():
         if points is not None:
             user.points = int(points)
         db.session.commit()
+        bump_player_version()
         return jsonify({'status': 'success', 'message': 'User updated'})
     except Exception as e:
         db.session.rollback()
@@ -858,21 +1337,25 @@ def admin_action():
         if action == 'delete_recipe':
             Recipe.query.filter_by(id=target_id).delete()
             db.session.commit()
+            bump_config_version()
+            bump_player_version()  # cascaded pour_history rows
             return jsonify({'status': 'success', 'message': 'Recipe deleted'})
         elif action == 'delete_user':
-            PourHistory.query.filter_by(user_id=target_id).delete()
             User.query.filter_by(id=target_id).delete()
             db.session.commit()
+            bump_player_version()
             return jsonify({'status': 'success', 'message': 'User deleted'})
         elif action == 'delete_all_users':
-            PourHistory.query.delete()
-            User.query.delete()
+            User.query.delete(synchronize_session=False)
             db.session.commit()
+            bump_player_version()
             return jsonify({'status': 'success', 'message': 'All users deleted'})
         elif action == 'reset_points':
-            for u in User.query.all():
-                u.points = 0
+            # One UPDATE statement instead of loading every user and
+            # flushing a per-row UPDATE.
+            User.query.update({User.points: 0}, synchronize_session=False)
             db.session.commit()
+            bump_player_version()
             return jsonify({'status': 'success', 'message': 'All points reset'})
     except Exception as e:
         db.session.rollback()
@@ -884,7 +1367,7 @@ def admin_action():
 @app.route('/api/admin/category-volumes', methods=['GET', 'POST'])
 @admin_required
 def admin_category_volumes():
-    machine_state = MachineState.get_instance()
+    machine_state = get_machine_state()
 
     if request.method == 'GET':
         return jsonify({
@@ -904,15 +1387,19 @@ def admin_category_volumes():
     try:
         volume = int(volume)
         if category == 'classic':
-            machine_state.classic_target_vol = volume
+            attr = 'classic_target_vol'
         elif category == 'highball':
-            machine_state.highball_target_vol = volume
+            attr = 'highball_target_vol'
         elif category == 'shot':
-            machine_state.shot_target_vol = volume
+            attr = 'shot_target_vol'
         else:
             return jsonify({'status': 'error', 'message': 'Invalid category'}), 400
 
-        db.session.commit()
+        # Idempotent clicks skip the commit (an fsync) and cache flush.
+        if getattr(machine_state, attr) != volume:
+            setattr(machine_state, attr, volume)
+            db.session.commit()
+            bump_config_version()
         return jsonify({'status': 'success', 'message': f'{category} volume updated to {volume}ml'})
     except (ValueError, TypeError):
         return jsonify({'status': 'error', 'message': 'Invalid volume'}), 400
@@ -921,7 +1408,7 @@ def admin_category_volumes():
 @app.route('/api/admin/taste-amount', methods=['GET', 'POST'])
 @admin_required
 def admin_taste_amount():
-    machine_state = MachineState.get_instance()
+    machine_state = get_machine_state()
 
     if request.method == 'GET':
         return jsonify({'status': 'success', 'taste_amount_ml': machine_state.taste_amount_ml})
@@ -936,8 +1423,10 @@ def admin_taste_amount():
         amount = int(amount)
         if amount < 10 or amount > 100:
             return jsonify({'status': 'error', 'message': 'Must be 10-100ml'}), 400
-        machine_state.taste_amount_ml = amount
-        db.session.commit()
+        if machine_state.taste_amount_ml != amount:
+            machine_state.taste_amount_ml = amount
+            db.session.commit()
+            bump_config_version()
         return jsonify({'status': 'success', 'message': f'Taste amount updated to {amount}ml', 'taste_amount_ml': amount})
     except (ValueError, TypeError):
         return jsonify({'status': 'error', 'message': 'Invalid value'}), 400
@@ -957,16 +1446,16 @@ def start_new_event():
     
     try:
         # Update event name
-        machine_state = MachineState.get_instance()
+        machine_state = get_machine_state()
         machine_state.current_event_name = event_name
         
-        # Delete all pour history first (foreign key constraint)
-        PourHistory.query.delete()
-        # Delete all guests
-        User.query.delete()
+        # Delete all guests; their pour history cascades at the DB level
+        User.query.delete(synchronize_session=False)
         
         db.session.commit()
-        
+        bump_config_version()
+        bump_player_version()
+
         return jsonify({
             'status': 'success',
             'message': f'New event "{event_name}" started! Guest list has been reset.',
@@ -1024,7 +1513,7 @@ def admin_test_pump(pump_id):
     action = data.get('action', 'toggle')  # 'on', 'off', or 'toggle'
     duration = data.get('duration', 5)  # Default 5 seconds for timed test
     
-    pump = Pump.query.get(pump_id)
+    pump = db.session.get(Pump, pump_id)
     if not pump:
         return jsonify({'status': 'error', 'message': 'Pump not found'}), 404
     
@@ -1035,14 +1524,14 @@ def admin_test_pump(pump_id):
     try:
         if action == 'on':
             if GPIO_AVAILABLE:
-                GPIO.setup(pin_number, GPIO.OUT)
-                GPIO.output(pin_number, GPIO.HIGH)
+                gpio_setup(pin_number)
+                gpio_write(pin_number, True)
             return jsonify({'status': 'success', 'message': f'Pump {pump_id} turned ON', 'state': 'on'})
         
         elif action == 'off':
             if GPIO_AVAILABLE:
-                GPIO.setup(pin_number, GPIO.OUT)
-                GPIO.output(pin_number, GPIO.LOW)
+                gpio_setup(pin_number)
+                gpio_write(pin_number, False)
             return jsonify({'status': 'success', 'message': f'Pump {pump_id} turned OFF', 'state': 'off'})
         
         elif action == 'timed':
@@ -1051,10 +1540,10 @@ def admin_test_pump(pump_id):
             
             def run_timed():
                 if GPIO_AVAILABLE:
-                    GPIO.setup(pin_number, GPIO.OUT)
-                    GPIO.output(pin_number, GPIO.HIGH)
+                    gpio_setup(pin_number)
+                    gpio_write(pin_number, True)
                     time.sleep(duration)
-                    GPIO.output(pin_number, GPIO.LOW)
+                    gpio_write(pin_number, False)
                 else:
                     print(f"[SIM] Pump {pump_id} running for {duration}s")
                     time.sleep(duration)
@@ -1075,7 +1564,7 @@ def admin_test_pump(pump_id):
         # Safety: turn off pump on error
         if GPIO_AVAILABLE and pin_number:
             try:
-                GPIO.output(pin_number, GPIO.LOW)
+                gpio_write(pin_number, False)
             except:
                 pass
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -1092,7 +1581,7 @@ def admin_calibrate_pump(pump_id):
     if not ml_measured or float(ml_measured) <= 0:
         return jsonify({'status': 'error', 'message': 'ml_measured is required and must be > 0'}), 400
     
-    pump = Pump.query.get(pump_id)
+    pump = db.session.get(Pump, pump_id)
     if not pump:
         return jsonify({'status': 'error', 'message': 'Pump not found'}), 404
     
@@ -1116,6 +1605,7 @@ def admin_calibrate_pump(pump_id):
         
         pump.seconds_per_50ml = seconds_per_50ml
         db.session.commit()
+        bump_config_version()
         
         return jsonify({
             'status': 'success',
@@ -1151,10 +1641,12 @@ if __name__ == '__main__':
         db.create_all()
         print("[OK] Database tables verified.")
 
-        # Ensure 8 pumps exist
+        # Ensure 8 pumps exist (single multi-row INSERT)
         if Pump.query.count() == 0:
-            for i in range(1, 9):
-                db.session.add(Pump(id=i, ingredient_name='Empty', is_active=False, seconds_per_50ml=3.0))
+            db.session.execute(insert(Pump), [
+                {'id': i, 'ingredient_name': 'Empty', 'is_active': False, 'seconds_per_50ml': 3.0}
+                for i in range(1, 9)
+            ])
             db.session.add(MachineState(id=1, is_pouring=False))
             db.session.commit()
             print("[INIT] Default pumps and machine state created.")
@@ -0,0 +1,39 @@
+"""
+Migration script to add indexes for the statistics and leaderboard queries
+Run this script once to update existing database
+"""
+from app import app, db
+from sqlalchemy import text
+
+INDEXES = [
+    ("ix_pour_history_user_cover",
+     "CREATE INDEX IF NOT EXISTS ix_pour_history_user_cover "
+     "ON pour_history (user_id, recipe_id, is_strong, points_awarded)"),
+    ("ix_user_points",
+     "CREATE INDEX IF NOT EXISTS ix_user_points ON user (points)"),
+    ("ix_recipe_category",
+     "CREATE INDEX IF NOT EXISTS ix_recipe_category ON recipe (category)"),
+    ("ix_user_points_nonadmin",
+     "CREATE INDEX IF NOT EXISTS ix_user_points_nonadmin "
+     "ON user (points DESC) WHERE nickname != 'Admin2001'"),
+]
+
+def migrate():
+    with app.app_context():
+        try:
+            for name, ddl in INDEXES:
+                print(f"Creating index '{name}' (if missing)...")
+                db.session.execute(text(ddl))
+            db.session.commit()
+            print("✓ Migration completed successfully!")
+            print("  - pour_history covering index for per-user statistics")
+            print("  - user points index for leaderboard/rank queries")
+            print("  - recipe category index for the grouped menu queries")
+            print("  - partial user points index for the leaderboard")
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Migration failed: {str(e)}")
+            raise
+
+if __name__ == '__main__':
+    migrate()
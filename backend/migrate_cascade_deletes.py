@@ -0,0 +1,57 @@
+"""
+Migration script to rebuild pour_history with ON DELETE CASCADE foreign keys
+Run this script once to update existing database
+"""
+from app import app, db
+
+NEW_TABLE_DDL = """
+CREATE TABLE pour_history_new (
+    id INTEGER NOT NULL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES user (id) ON DELETE CASCADE,
+    recipe_id INTEGER NOT NULL REFERENCES recipe (id) ON DELETE CASCADE,
+    timestamp DATETIME,
+    is_strong BOOLEAN NOT NULL,
+    points_awarded INTEGER NOT NULL
+)
+"""
+
+
+def migrate():
+    """SQLite cannot ALTER a foreign key, so the table is rebuilt."""
+    with app.app_context():
+        conn = db.engine.raw_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("PRAGMA foreign_keys=OFF")
+
+            # Drop rows orphaned by pre-cascade deletes; they would
+            # violate the enforced constraints going forward.
+            cur.execute("DELETE FROM pour_history WHERE user_id NOT IN (SELECT id FROM user)")
+            cur.execute("DELETE FROM pour_history WHERE recipe_id NOT IN (SELECT id FROM recipe)")
+
+            print("Rebuilding pour_history with ON DELETE CASCADE...")
+            cur.execute(NEW_TABLE_DDL)
+            cur.execute(
+                "INSERT INTO pour_history_new "
+                "SELECT id, user_id, recipe_id, timestamp, is_strong, points_awarded FROM pour_history"
+            )
+            cur.execute("DROP TABLE pour_history")
+            cur.execute("ALTER TABLE pour_history_new RENAME TO pour_history")
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS ix_pour_history_user_cover "
+                "ON pour_history (user_id, recipe_id, is_strong, points_awarded)"
+            )
+            conn.commit()
+            cur.execute("PRAGMA foreign_keys=ON")
+            print("✓ Migration completed successfully!")
+            print("  - user/recipe deletes now cascade to pour_history in the database")
+        except Exception as e:
+            conn.rollback()
+            print(f"✗ Migration failed: {str(e)}")
+            raise
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    migrate()
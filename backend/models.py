@@ -5,13 +5,37 @@ import json
 import secrets
 import string
 
-db = SQLAlchemy()
+# orjson parses/serializes the small ingredients dicts several times
+# faster than stdlib json; optional, mirroring the app-level provider.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads_ingredients(raw):
+    if not raw:
+        return {}
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_ingredients(ingredients):
+    if orjson is not None:
+        return orjson.dumps(ingredients).decode()
+    return json.dumps(ingredients, separators=(',', ':'))
+
+# expire_on_commit off: sessions are request-scoped, so attributes read
+# after a commit (user.points in the pour response, machine state after
+# the flag write) come from memory instead of a refresh SELECT.
+db = SQLAlchemy(session_options={"expire_on_commit": False})
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     nickname = db.Column(db.String(80), unique=True, nullable=False)
     recovery_key = db.Column(db.String(6), unique=True, nullable=False)
-    points = db.Column(db.Integer, default=0)
+    points = db.Column(db.Integer, default=0, index=True)  # Leaderboard/rank ORDER BY and COUNT queries
     
     @staticmethod
     def generate_recovery_key():
@@ -34,6 +58,13 @@ class User(UserMixin, db.Model):
     def __repr__(self):
         return f'<User {self.nickname}>'
 
+
+# Partial index for the leaderboard: ORDER BY points DESC with the admin
+# account excluded is answered from this index alone, and the admin row
+# never enters the B-tree.
+db.Index('ix_user_points_nonadmin', User.points.desc(),
+         sqlite_where=User.nickname != 'Admin2001')
+
 class Pump(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     # Pump ID 1-8
@@ -66,13 +97,22 @@ class Recipe(db.Model):
     ingredients_json = db.Column(db.Text, nullable=False, default="{}") 
     points_reward = db.Column(db.Integer, default=0)  # DEPRECATED: Points are now auto-calculated at pour time (1ml alcohol = 1 point)
     image_url = db.Column(db.String(200), nullable=True) # Optional for UI
-    category = db.Column(db.String(20), default='classic', nullable=False)  # Drink category: 'classic', 'highball', or 'shot'
+    category = db.Column(db.String(20), default='classic', nullable=False, index=True)  # Drink category: 'classic', 'highball', or 'shot'
     
     def get_ingredients(self):
-        return json.loads(self.ingredients_json)
+        # Memoized per instance, keyed by the raw string so any write to
+        # ingredients_json (setter or direct assignment) invalidates it.
+        raw = self.ingredients_json
+        if getattr(self, '_ingredients_raw', None) != raw:
+            self._ingredients_cache = _loads_ingredients(raw)
+            self._ingredients_raw = raw
+        return self._ingredients_cache
 
     def set_ingredients(self, ingredients_dict):
-        self.ingredients_json = json.dumps(ingredients_dict)
+        # Prime the memo so a get right after a set never re-parses.
+        self.ingredients_json = _dumps_ingredients(ingredients_dict)
+        self._ingredients_cache = ingredients_dict
+        self._ingredients_raw = self.ingredients_json
 
     def to_dict(self):
         return {
@@ -88,15 +128,24 @@ class Recipe(db.Model):
 
 class PourHistory(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    recipe_id = db.Column(db.Integer, db.ForeignKey('recipe.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    recipe_id = db.Column(db.Integer, db.ForeignKey('recipe.id', ondelete='CASCADE'), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     is_strong = db.Column(db.Boolean, default=False, nullable=False)  # Track if Strong Mode was used
     points_awarded = db.Column(db.Integer, default=0, nullable=False)  # Points awarded for this specific pour
-    
-    user = db.relationship('User', backref=db.backref('history', lazy=True))
+
+    # passive_deletes: the database cascades history deletes, so the ORM
+    # must not load and null out child rows when a user is deleted.
+    user = db.relationship('User', backref=db.backref('history', lazy=True, passive_deletes=True))
     recipe = db.relationship('Recipe')
 
+    # Covering index: the statistics queries filter by user_id and only
+    # touch recipe_id/is_strong/points_awarded, so they can be answered
+    # from the index without reading table rows.
+    __table_args__ = (
+        db.Index('ix_pour_history_user_cover', 'user_id', 'recipe_id', 'is_strong', 'points_awarded'),
+    )
+
 class MachineState(db.Model):
     """Singleton table to track machine state"""
     id = db.Column(db.Integer, primary_key=True)